@@ -71,6 +71,137 @@ def load_data():
 
     return df
 
+# ===================== ESTATÍSTICAS EM STREAMING =====================
+
+# Sketch de quantis com erro relativo limitado (estilo DDSketch): cada valor cai
+# num bucket logarítmico e o quantil estimado fica a no máximo ALFA_SKETCH do real.
+ALFA_SKETCH = 0.01
+GAMMA_SKETCH = (1 + ALFA_SKETCH) / (1 - ALFA_SKETCH)
+TAMANHO_BLOCO = 50_000
+QUANTIS_SKETCH = {'P10': 0.1, 'Mediana': 0.5, 'P90': 0.9}
+
+
+def agregar_bloco(codigos, valores, n_grupos):
+    """Agregados de um bloco por grupo: contagem, média, M2, mín, máx e sketch."""
+    contagem = np.bincount(codigos, minlength=n_grupos).astype(float)
+    soma = np.bincount(codigos, weights=valores, minlength=n_grupos)
+    media = np.divide(soma, contagem, out=np.zeros(n_grupos), where=contagem > 0)
+    desvio = valores - media[codigos]
+    m2 = np.bincount(codigos, weights=desvio * desvio, minlength=n_grupos)
+
+    minimo = np.full(n_grupos, np.inf)
+    maximo = np.full(n_grupos, -np.inf)
+    np.minimum.at(minimo, codigos, valores)
+    np.maximum.at(maximo, codigos, valores)
+
+    # Bucket logarítmico por sinal (zero fica no bucket 0 com sinal 0)
+    sinal = np.sign(valores).astype(np.int64)
+    absoluto = np.abs(valores)
+    indice = np.zeros(len(valores), dtype=np.int64)
+    positivos = absoluto > 0
+    indice[positivos] = np.ceil(
+        np.log(absoluto[positivos]) / np.log(GAMMA_SKETCH)
+    ).astype(np.int64)
+    sketch = pd.DataFrame({
+        'grupo': codigos, 'sinal': sinal, 'indice': indice
+    }).value_counts(sort=False)
+
+    return {
+        'contagem': contagem, 'media': media, 'm2': m2,
+        'minimo': minimo, 'maximo': maximo, 'sketch': sketch,
+    }
+
+
+def combinar_agregados(a, b):
+    """Combina dois agregados (fórmula paralela de Chan + soma dos sketches)."""
+    contagem = a['contagem'] + b['contagem']
+    delta = b['media'] - a['media']
+    peso_b = np.divide(b['contagem'], contagem, out=np.zeros_like(contagem), where=contagem > 0)
+    media = a['media'] + delta * peso_b
+    m2 = a['m2'] + b['m2'] + delta * delta * a['contagem'] * peso_b
+
+    sketch = pd.concat([a['sketch'], b['sketch']])
+    sketch = sketch.groupby(level=[0, 1, 2], sort=False).sum()
+
+    return {
+        'contagem': contagem, 'media': media, 'm2': m2,
+        'minimo': np.minimum(a['minimo'], b['minimo']),
+        'maximo': np.maximum(a['maximo'], b['maximo']),
+        'sketch': sketch,
+    }
+
+
+def quantis_sketch(buckets, quantis):
+    """Estima quantis a partir dos buckets (sinal, indice) -> contagem de um grupo."""
+    buckets = buckets.reset_index()
+    buckets.columns = ['sinal', 'indice', 'contagem']
+    # Ordem crescente de valor: negativos com índice decrescente, zero, positivos
+    buckets['ordem'] = buckets['sinal'] * buckets['indice']
+    buckets = buckets.sort_values(['sinal', 'ordem'])
+    representante = np.where(
+        buckets['sinal'] == 0,
+        0.0,
+        buckets['sinal'] * 2 * GAMMA_SKETCH ** buckets['indice'] / (GAMMA_SKETCH + 1),
+    )
+    acumulado = buckets['contagem'].cumsum().to_numpy()
+    total = acumulado[-1]
+    # Interpola entre os postos vizinhos, como pandas median/quantile
+    postos = np.array([q * (total - 1) for q in quantis])
+    inferior = representante[np.searchsorted(acumulado, np.floor(postos), side='right')]
+    superior = representante[np.searchsorted(acumulado, np.ceil(postos), side='right')]
+    return inferior + (superior - inferior) * (postos - np.floor(postos))
+
+
+@st.cache_data
+def estatisticas_por_grupo(df, col_grupo, col_valor):
+    """Estatísticas por grupo em passagem única, sem ordenar os dados brutos.
+
+    Contagem, média, desvio padrão, mínimo e máximo vêm de agregados de Welford
+    combináveis entre blocos; os quantis vêm do sketch logarítmico.
+    """
+    colunas = ['Contagem', 'Média', 'Mediana', 'P10', 'P90', 'Desvio Padrão', 'Mínimo', 'Máximo']
+
+    codigos, grupos = pd.factorize(df[col_grupo])
+    valores = pd.to_numeric(df[col_valor], errors='coerce').to_numpy(dtype=float)
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    codigos, valores = codigos[validos], valores[validos]
+
+    if len(valores) == 0:
+        return pd.DataFrame(columns=colunas)
+
+    agregado = None
+    for inicio in range(0, len(valores), TAMANHO_BLOCO):
+        bloco = agregar_bloco(
+            codigos[inicio:inicio + TAMANHO_BLOCO],
+            valores[inicio:inicio + TAMANHO_BLOCO],
+            len(grupos),
+        )
+        agregado = bloco if agregado is None else combinar_agregados(agregado, bloco)
+
+    contagem = agregado['contagem']
+    desvio_padrao = np.sqrt(np.divide(
+        agregado['m2'], contagem - 1, out=np.full(len(grupos), np.nan), where=contagem > 1
+    ))
+
+    resultado = pd.DataFrame({
+        'Contagem': contagem.astype(int),
+        'Média': agregado['media'],
+        'Desvio Padrão': desvio_padrao,
+        'Mínimo': agregado['minimo'],
+        'Máximo': agregado['maximo'],
+    }, index=pd.Index(grupos, name=col_grupo))
+
+    estimativas = np.full((len(grupos), len(QUANTIS_SKETCH)), np.nan)
+    for codigo, buckets in agregado['sketch'].groupby(level=0, sort=False):
+        estimativas[codigo] = quantis_sketch(buckets.droplevel(0), QUANTIS_SKETCH.values())
+    # O valor exato de mínimo/máximo limita a estimativa dos extremos
+    estimativas = np.clip(estimativas, resultado[['Mínimo']].to_numpy(), resultado[['Máximo']].to_numpy())
+    for i, nome in enumerate(QUANTIS_SKETCH):
+        resultado[nome] = estimativas[:, i]
+
+    resultado = resultado[resultado['Contagem'] > 0]
+    return resultado[colunas]
+
 try:
     df = load_data()
     st.sidebar.success("✅ Dados carregados com sucesso!")
@@ -327,18 +458,52 @@ if 'Estado' in df_filt.columns and 'Score SERASA' in df_filt.columns:
         # Resetar tema
         sns.set_theme()
 
-        # Estatísticas
-        with st.expander("📊 Estatísticas por Estado"):
-            stats_estado = df_ridge.groupby('Estado')['valor'].agg([
-                'count', 'mean', 'median', 'std', 'min', 'max'
-            ]).round(2)
-            stats_estado.columns = ['Contagem', 'Média', 'Mediana', 'Desvio Padrão', 'Mínimo', 'Máximo']
-            stats_estado = stats_estado.sort_values('Média', ascending=False)
-            st.dataframe(stats_estado, use_container_width=True)
-
 else:
     st.warning("⚠️ Colunas necessárias não encontradas para Ridge Plot")
 
+# ===================== ESTATÍSTICAS POR GRUPO =====================
+
+st.header("📊 Estatísticas por Grupo")
+
+grupos_stats = [
+    c for c in ["Estado", "Regiao", "Status", "Faixa Score", "Faixa Idade", "Perfil_Risco"]
+    if c in df_filt.columns
+]
+variaveis_stats = [
+    v for v in ["Score SERASA", "Idade", "Valor Financiado", "Limite de Crédito", "Renda Pres"]
+    if v in df_filt.columns
+]
+
+if not grupos_stats or not variaveis_stats:
+    st.warning("⚠️ Dados insuficientes para gerar estatísticas por grupo")
+else:
+    col_stats1, col_stats2, col_stats3 = st.columns(3)
+
+    with col_stats1:
+        grupo_stats = st.selectbox("Agrupar por", grupos_stats, key='stats_grupo')
+
+    with col_stats2:
+        var_stats = st.selectbox("Variável", variaveis_stats, key='stats_var')
+
+    with col_stats3:
+        min_obs_stats = st.slider(
+            "Mínimo de observações por grupo",
+            min_value=1,
+            max_value=100,
+            value=1,
+            key='stats_min_obs'
+        )
+
+    with st.expander(f"📊 Estatísticas por {grupo_stats}"):
+        stats_grupo_df = estatisticas_por_grupo(df_filt[[grupo_stats, var_stats]], grupo_stats, var_stats)
+        stats_grupo_df = stats_grupo_df[stats_grupo_df['Contagem'] >= min_obs_stats].round(2)
+        stats_grupo_df = stats_grupo_df.sort_values('Média', ascending=False)
+        st.dataframe(stats_grupo_df, use_container_width=True)
+        st.caption(
+            f"Mediana, P10 e P90 estimados por sketch de quantis "
+            f"(erro relativo ≤ {ALFA_SKETCH:.0%})."
+        )
+
 # ===================== KDE CONFIGURÁVEL =====================
 
 st.header("📉 Distribuições (KDE)")